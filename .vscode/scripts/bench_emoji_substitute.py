@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for emoji_substitute.py
+Generates deterministic synthetic corpora, times replace_emojis_in_text,
+process_file, get_files_to_process and a full command-line run, and checks
+every output against the recorded baseline.
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+SCRIPT_PATH = SCRIPT_DIR / "emoji_substitute.py"
+BASELINE_PATH = SCRIPT_DIR / "bench_emoji_substitute.baseline.json"
+
+sys.path.insert(0, str(SCRIPT_DIR))
+import emoji_substitute as es  # noqa: E402
+
+SEED = 20250813
+
+# Plain code-like tokens that make up the bulk of every corpus
+VOCABULARY = [
+    "def", "return", "const", "import", "from", "class", "self", "value", "result",
+    "config", "=", "==", "(", ")", "{", "}", "[", "]", ":", ";", "->", "#", "//",
+    "TODO", "status", "error", "items", "index", "await", "async", "true", "false",
+]
+
+# Non-emoji, non-ASCII words (accents, dashes, arrows, CJK). Without them the
+# emoji-free corpora are pure ASCII and `emoji in text` returns immediately,
+# so those benchmarks would measure nothing.
+NON_ASCII_WORDS = ["café", "naïve", "résumé", "über", "—", "–", "…", "→", "±", "日本語", "中文", "테스트"]
+NON_ASCII_RATE = 0.03
+
+MAPPED_EMOJIS = list(es.EMOJI_REPLACEMENTS)
+# Unmapped emoji are left alone but still cost a decode and a scan
+UNMAPPED_EMOJIS = ["🐛", "🦀", "☕", "🧩", "🗂", "🏁"]
+
+# name -> (size in bytes at scale 1.0, emoji density, variation-selector heavy)
+TEXT_CORPORA = {
+    "small-none": (2_000, 0.0, False),
+    "small-heavy": (2_000, 0.10, False),
+    "large-none": (4_000_000, 0.0, False),
+    "large-sparse": (4_000_000, 0.001, False),
+    "large-light": (4_000_000, 0.01, False),
+    "large-heavy": (4_000_000, 0.10, False),
+    "large-vs-heavy": (4_000_000, 0.05, True),
+}
+
+# Directory tree layout: depth, subdirectories per level, files per directory
+TREE_DEPTH = 4
+TREE_FANOUT = 3
+TREE_FILES_PER_DIR = 4
+NODE_MODULES_PACKAGES = 60
+
+def generate_text(rng, size, density, vs_heavy=False):
+    """Generate roughly size characters of code-like text with the given emoji density."""
+    emoji_pool = MAPPED_EMOJIS + UNMAPPED_EMOJIS
+    parts = []
+    length = 0
+    column = 0
+    while length < size:
+        if rng.random() < density:
+            token = rng.choice(emoji_pool)
+            if vs_heavy:
+                # Mix of explicit VS16/VS15 suffixes and stray selectors
+                token += rng.choice((es.VARIATION_SELECTOR_16, es.VARIATION_SELECTOR_15, es.VARIATION_SELECTOR_16 * 2))
+        elif vs_heavy and rng.random() < density:
+            token = rng.choice(VOCABULARY) + es.VARIATION_SELECTOR_16
+        elif rng.random() < NON_ASCII_RATE:
+            token = rng.choice(NON_ASCII_WORDS)
+        else:
+            token = rng.choice(VOCABULARY)
+        column += 1
+        separator = "\n" if column % 12 == 0 else " "
+        parts.append(token + separator)
+        length += len(token) + 1
+    return "".join(parts)
+
+def build_text_corpora(scale):
+    rng = random.Random(SEED)
+    return {
+        name: generate_text(rng, max(1, int(size * scale)), density, vs_heavy)
+        for name, (size, density, vs_heavy) in TEXT_CORPORA.items()
+    }
+
+def build_tree(root, scale):
+    """Create a deep source tree plus node_modules-style clutter under root."""
+    rng = random.Random(SEED + 1)
+    file_size = max(1, int(4_000 * scale))
+    extensions = ["py", "ts", "md", "json", "txt", "bin"]
+
+    def populate(directory, depth):
+        directory.mkdir(parents=True, exist_ok=True)
+        for i in range(TREE_FILES_PER_DIR):
+            ext = extensions[(depth + i) % len(extensions)]
+            text = generate_text(rng, file_size, rng.choice((0.0, 0.0, 0.005, 0.05)))
+            (directory / f"file_{i}.{ext}").write_text(text, encoding="utf-8", newline="\n")
+        if depth < TREE_DEPTH:
+            for j in range(TREE_FANOUT):
+                populate(directory / f"dir_{depth}_{j}", depth + 1)
+
+    populate(root / "src", 1)
+    for i in range(NODE_MODULES_PACKAGES):
+        package = root / "node_modules" / f"pkg-{i}" / "lib"
+        package.mkdir(parents=True)
+        (package / "index.js").write_text(generate_text(rng, file_size // 4, 0.0), encoding="utf-8", newline="\n")
+        (package.parent / "package.json").write_text(json.dumps({"name": f"pkg-{i}"}), encoding="utf-8")
+        (package.parent / "README.md").write_text(generate_text(rng, file_size // 4, 0.01), encoding="utf-8", newline="\n")
+
+def _digest_text(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+def _digest_tree(root):
+    """Hash every file under root, normalising newlines so results match across platforms."""
+    digest = hashlib.sha256()
+    for path in sorted(p for p in root.rglob("*") if p.is_file()):
+        digest.update(path.relative_to(root).as_posix().encode("utf-8") + b"\0")
+        digest.update(path.read_bytes().replace(b"\r\n", b"\n") + b"\0")
+    return digest.hexdigest()
+
+def _best_of(repeat, func, setup=None):
+    """Run func repeat times and return (best seconds, last result)."""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        started = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+def run_benchmarks(scale=1.0, repeat=3, workdir=None):
+    """Run every benchmark and return a list of result dicts."""
+    results = []
+
+    def record(name, seconds, size, digest):
+        results.append({
+            "name": name,
+            "seconds": round(seconds, 6),
+            "bytes": size,
+            "mb_per_s": round(size / 1e6 / seconds, 3) if seconds > 0 and size else None,
+            "digest": digest,
+        })
+
+    corpora = build_text_corpora(scale)
+
+    for name, text in corpora.items():
+        size = len(text.encode("utf-8"))
+        seconds, (new_text, _) = _best_of(repeat, lambda: es.replace_emojis_in_text(text))
+        record(f"replace_emojis_in_text/{name}", seconds, size, _digest_text(new_text))
+
+    corpus_dir = workdir / "corpus"
+    corpus_dir.mkdir()
+    for name, text in corpora.items():
+        source = corpus_dir / f"{name}.md"
+        source.write_text(text, encoding="utf-8", newline="\n")
+        target = corpus_dir / f"{name}.work.md"
+        seconds, _ = _best_of(
+            repeat,
+            lambda: es.process_file(target, quiet=True),
+            setup=lambda: shutil.copyfile(source, target),
+        )
+        normalised = target.read_bytes().replace(b"\r\n", b"\n")
+        record(f"process_file/{name}", seconds, source.stat().st_size, hashlib.sha256(normalised).hexdigest())
+
+    tree = workdir / "tree"
+    build_tree(tree, scale)
+    tree_bytes = sum(p.stat().st_size for p in tree.rglob("*") if p.is_file())
+    default_extensions = ["py", "js", "ts", "jsx", "tsx", "md", "txt", "json", "yaml", "yml", "toml", "cfg", "ini"]
+    seconds, files = _best_of(repeat, lambda: es.get_files_to_process([str(tree)], default_extensions))
+    listing = "\n".join(p.relative_to(tree).as_posix() for p in files)
+    record("get_files_to_process/tree", seconds, 0, _digest_text(listing))
+
+    run_dir = workdir / "run"
+    seconds, _ = _best_of(
+        repeat,
+        lambda: subprocess.run([sys.executable, str(SCRIPT_PATH), "-q", str(run_dir)], check=True),
+        setup=lambda: (shutil.rmtree(run_dir, ignore_errors=True), shutil.copytree(tree, run_dir)),
+    )
+    record("end_to_end/tree", seconds, tree_bytes, _digest_tree(run_dir))
+
+    return results
+
+def check_against_baseline(results, baseline):
+    """Return the names of benchmarks whose output digest differs from the baseline."""
+    return [
+        result["name"] for result in results
+        if baseline.get(result["name"]) != result["digest"]
+    ]
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark emoji_substitute.py against deterministic synthetic corpora"
+    )
+    parser.add_argument(
+        "--scale",
+        type=float,
+        default=1.0,
+        help="Multiply corpus sizes (default: 1.0; output is only checked at scale 1.0)"
+    )
+    parser.add_argument(
+        "--repeat",
+        "-r",
+        type=int,
+        default=3,
+        help="Runs per benchmark; the best time is reported (default: 3)"
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Print results as JSON"
+    )
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help=f"Record output digests as the new baseline in {BASELINE_PATH.name}"
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="emoji_bench_") as tmp:
+        results = run_benchmarks(args.scale, max(1, args.repeat), Path(tmp))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{'benchmark':<44} {'best s':>10} {'MB/s':>10}")
+        print("-" * 66)
+        for result in results:
+            rate = f"{result['mb_per_s']:.2f}" if result["mb_per_s"] is not None else "-"
+            print(f"{result['name']:<44} {result['seconds']:>10.4f} {rate:>10}")
+
+    if args.update_baseline:
+        if args.scale != 1.0:
+            parser.error("--update-baseline requires --scale 1.0")
+        baseline = {result["name"]: result["digest"] for result in results}
+        BASELINE_PATH.write_text(json.dumps(baseline, indent=2) + "\n", encoding="utf-8")
+        print(f"\n✓ Baseline written to {BASELINE_PATH}", file=sys.stderr)
+        return
+
+    if args.scale != 1.0:
+        print("\n⌕ Output check skipped (baseline is recorded at scale 1.0)", file=sys.stderr)
+        return
+
+    baseline = json.loads(BASELINE_PATH.read_text(encoding="utf-8"))
+    mismatches = check_against_baseline(results, baseline)
+    if mismatches:
+        print("\n✗ Output differs from baseline:", file=sys.stderr)
+        for name in mismatches:
+            print(f"  {name}", file=sys.stderr)
+        sys.exit(1)
+    print(f"\n✓ All {len(results)} outputs match the baseline", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
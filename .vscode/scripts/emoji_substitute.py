@@ -4,10 +4,24 @@ Emoji to Unicode Character Replacer
 Replaces common emojis used in coding with monospace-friendly Unicode characters.
 """
 
+import io
 import re
 import sys
 import os
+import getpass
+import socket
+import socketserver
+import stat
+import struct
+import subprocess
+import tempfile
 import argparse
+import cProfile
+import json
+import pstats
+import time
+from bisect import bisect_right
+from collections import Counter
 from pathlib import Path
 
 # Emoji to Unicode mapping for coding contexts
@@ -131,31 +145,97 @@ def _build_expanded_mapping(base_map: dict[str, str]) -> dict[str, str]:
 
 EMOJI_REPLACEMENTS_EXPANDED = _build_expanded_mapping(EMOJI_REPLACEMENTS)
 
+def _build_prefilter_prefixes(mapping: dict[str, str]) -> tuple[bytes, ...]:
+    """Collect the distinct UTF-8 lead byte pairs of every mapped key.
+    Every key starts with a multi-byte character, so a file that contains none
+    of these pairs (F0 9F, E2 9C, EF B8, ...) cannot contain a replaceable emoji.
+    """
+    return tuple(sorted({key.encode("utf-8")[:2] for key in mapping}))
+
+PREFILTER_PREFIXES = _build_prefilter_prefixes(EMOJI_REPLACEMENTS_EXPANDED)
+
+def may_contain_emojis(data: bytes) -> bool:
+    """Cheap byte-level check run before decoding a file."""
+    if data.isascii():
+        return False
+    return any(prefix in data for prefix in PREFILTER_PREFIXES)
+
 # other characters for potential future use
 # |⍥|⚇|⊍|⋮|⋯|⋱|±|🜏|
 
-def replace_emojis_in_text(text):
-    """Replace emojis in text with Unicode equivalents."""
+def replace_emojis_in_text(text, emoji_counts=None):
+    """Replace emojis in text with Unicode equivalents.
+    If emoji_counts (a Counter) is given, it is updated with per-emoji occurrences.
+    """
     # Normalize by stripping variation selectors first to maximize matches
     result = text.replace(VARIATION_SELECTOR_16, "").replace(VARIATION_SELECTOR_15, "")
     replacements_made = []
     
     for emoji, replacement in EMOJI_REPLACEMENTS_EXPANDED.items():
         if emoji in result:
+            if emoji_counts is not None:
+                emoji_counts[emoji] += result.count(emoji)
             result = result.replace(emoji, replacement)
             replacements_made.append(f"{emoji} → {replacement}")
     
     return result, replacements_made
 
-def process_file(file_path, dry_run=False, verbose=False, quiet=False):
-    """Process a single file to replace emojis."""
+def replace_emojis_in_line_ranges(text, line_ranges, emoji_counts=None):
+    """Replace emojis only on the given 1-based, inclusive (start, end) line ranges."""
+    # Split on "\n" only: git does not count \x0c, \u2028 etc. as line breaks
+    lines = text.split("\n")
+    replacements_made = []
+    for start, end in line_ranges:
+        for index in range(max(start, 1) - 1, min(end, len(lines))):
+            new_line, replacements = replace_emojis_in_text(lines[index], emoji_counts)
+            if replacements:
+                lines[index] = new_line
+                replacements_made.extend(r for r in replacements if r not in replacements_made)
+    return "\n".join(lines), replacements_made
+
+def process_file(file_path, dry_run=False, verbose=False, quiet=False, prefilter=True, stats=None,
+                 line_ranges=None, emoji_counts=None):
+    """Process a single file to replace emojis.
+    When prefilter is enabled, files whose raw bytes cannot contain a mapped
+    emoji are skipped without scanning; non-UTF-8 input is still reported as
+    an error. If line_ranges is given, only those lines are rewritten.
+    If stats (a Counter) is given, file counts, bytes and per-phase timings
+    are accumulated into it; emoji_counts collects per-emoji replacement counts.
+    """
+    if stats is None:
+        stats = Counter()
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
+        started = time.perf_counter()
+        with open(file_path, 'rb') as f:
+            data = f.read()
+        stats["bytes_read"] += len(data)
+        stats["read_seconds"] += time.perf_counter() - started
+
+        if prefilter and not may_contain_emojis(data):
+            if not data.isascii():
+                # Still surface undecodable files as errors rather than skips
+                data.decode('utf-8')
+            stats["prefiltered"] += 1
+            if verbose and not quiet:
+                print(f"⌕ {file_path}: No emojis found (prefilter)")
+            return 0
+
+        started = time.perf_counter()
+        # Whole files keep universal-newline handling; hunk mode must leave
+        # untouched lines (including their \r\n) byte-identical
+        newline = None if line_ranges is None else ''
+        with io.TextIOWrapper(io.BytesIO(data), encoding='utf-8', newline=newline) as f:
             content = f.read()
         
-        new_content, replacements = replace_emojis_in_text(content)
+        if line_ranges is None:
+            new_content, replacements = replace_emojis_in_text(content, emoji_counts)
+        else:
+            new_content, replacements = replace_emojis_in_line_ranges(content, line_ranges, emoji_counts)
+        stats["files_scanned"] += 1
+        stats["replace_seconds"] += time.perf_counter() - started
         
         if replacements:
+            stats["files_modified"] += 1
             if verbose and not quiet:
                 print(f"\n⚇ {file_path}:")
                 for replacement in replacements:
@@ -164,8 +244,11 @@ def process_file(file_path, dry_run=False, verbose=False, quiet=False):
                 print(f"✓ {file_path}: {len(replacements)} replacement(s)")
             
             if not dry_run:
-                with open(file_path, 'w', encoding='utf-8') as f:
+                started = time.perf_counter()
+                with open(file_path, 'w', encoding='utf-8', newline=newline) as f:
                     f.write(new_content)
+                stats["bytes_written"] += os.path.getsize(file_path)
+                stats["write_seconds"] += time.perf_counter() - started
                     
         elif verbose and not quiet:
             print(f"⌕ {file_path}: No emojis found")
@@ -173,10 +256,152 @@ def process_file(file_path, dry_run=False, verbose=False, quiet=False):
         return len(replacements)
         
     except Exception as e:
+        stats["errors"] += 1
         if not quiet:
             print(f"✗ Error processing {file_path}: {e}")
         return 0
 
+def build_run_report(files_total, stats, emoji_counts, total_replacements, elapsed, dry_run=False):
+    """Assemble the --report summary from the counters collected during a run."""
+    bytes_read = stats["bytes_read"]
+    return {
+        "dry_run": dry_run,
+        "files": {
+            "total": files_total,
+            "scanned": stats["files_scanned"],
+            "skipped": stats["prefiltered"],
+            "errors": stats["errors"],
+            "modified": stats["files_modified"],
+        },
+        "bytes": {"read": bytes_read, "written": stats["bytes_written"]},
+        "replacements": {
+            "total": total_replacements,
+            "by_emoji": dict(emoji_counts.most_common()),
+        },
+        "timings_seconds": {
+            phase: round(stats[f"{phase}_seconds"], 6)
+            for phase in ("discovery", "read", "replace", "write")
+        } | {"total": round(elapsed, 6)},
+        "throughput_mb_per_s": round(bytes_read / 1e6 / elapsed, 3) if elapsed > 0 else None,
+    }
+
+def _print_run_report(report):
+    files, data, timings = report["files"], report["bytes"], report["timings_seconds"]
+    print("\n◊ Run report")
+    print(f"  Files:    {files['total']} total, {files['scanned']} scanned, "
+          f"{files['skipped']} skipped, {files['errors']} error(s), {files['modified']} modified")
+    print(f"  Bytes:    {data['read']} read, {data['written']} written")
+    print("  Timings:  " + ", ".join(f"{phase} {seconds:.4f}s" for phase, seconds in timings.items()))
+    if report["throughput_mb_per_s"] is not None:
+        print(f"  Rate:     {report['throughput_mb_per_s']:.3f} MB/s")
+    for emoji, count in report["replacements"]["by_emoji"].items():
+        print(f"  {emoji} ×{count}")
+
+# Sorted, non-overlapping codepoint ranges with the Unicode Emoji property
+# (emoji-data.txt, Unicode 16.0), minus ASCII keycap bases and ©/®/™.
+EMOJI_RANGES = (
+    (0x203C, 0x203C), (0x2049, 0x2049), (0x2139, 0x2139), (0x2194, 0x2199),
+    (0x21A9, 0x21AA), (0x231A, 0x231B), (0x2328, 0x2328), (0x23CF, 0x23CF),
+    (0x23E9, 0x23F3), (0x23F8, 0x23FA), (0x24C2, 0x24C2), (0x25AA, 0x25AB),
+    (0x25B6, 0x25B6), (0x25C0, 0x25C0), (0x25FB, 0x25FE), (0x2600, 0x2604),
+    (0x260E, 0x260E), (0x2611, 0x2611), (0x2614, 0x2615), (0x2618, 0x2618),
+    (0x261D, 0x261D), (0x2620, 0x2620), (0x2622, 0x2623), (0x2626, 0x2626),
+    (0x262A, 0x262A), (0x262E, 0x262F), (0x2638, 0x263A), (0x2640, 0x2640),
+    (0x2642, 0x2642), (0x2648, 0x2653), (0x265F, 0x2660), (0x2663, 0x2663),
+    (0x2665, 0x2666), (0x2668, 0x2668), (0x267B, 0x267B), (0x267E, 0x267F),
+    (0x2692, 0x2697), (0x2699, 0x2699), (0x269B, 0x269C), (0x26A0, 0x26A1),
+    (0x26A7, 0x26A7), (0x26AA, 0x26AB), (0x26B0, 0x26B1), (0x26BD, 0x26BE),
+    (0x26C4, 0x26C5), (0x26C8, 0x26C8), (0x26CE, 0x26CF), (0x26D1, 0x26D1),
+    (0x26D3, 0x26D4), (0x26E9, 0x26EA), (0x26F0, 0x26F5), (0x26F7, 0x26FA),
+    (0x26FD, 0x26FD), (0x2702, 0x2702), (0x2705, 0x2705), (0x2708, 0x270D),
+    (0x270F, 0x270F), (0x2712, 0x2712), (0x2714, 0x2714), (0x2716, 0x2716),
+    (0x271D, 0x271D), (0x2721, 0x2721), (0x2728, 0x2728), (0x2733, 0x2734),
+    (0x2744, 0x2744), (0x2747, 0x2747), (0x274C, 0x274C), (0x274E, 0x274E),
+    (0x2753, 0x2755), (0x2757, 0x2757), (0x2763, 0x2764), (0x2795, 0x2797),
+    (0x27A1, 0x27A1), (0x27B0, 0x27B0), (0x27BF, 0x27BF), (0x2934, 0x2935),
+    (0x2B05, 0x2B07), (0x2B1B, 0x2B1C), (0x2B50, 0x2B50), (0x2B55, 0x2B55),
+    (0x3030, 0x3030), (0x303D, 0x303D), (0x3297, 0x3297), (0x3299, 0x3299),
+    (0x1F004, 0x1F004), (0x1F0CF, 0x1F0CF), (0x1F170, 0x1F171), (0x1F17E, 0x1F17F),
+    (0x1F18E, 0x1F18E), (0x1F191, 0x1F19A), (0x1F1E6, 0x1F1FF), (0x1F201, 0x1F202),
+    (0x1F21A, 0x1F21A), (0x1F22F, 0x1F22F), (0x1F232, 0x1F23A), (0x1F250, 0x1F251),
+    (0x1F300, 0x1F321), (0x1F324, 0x1F393), (0x1F396, 0x1F397), (0x1F399, 0x1F39B),
+    (0x1F39E, 0x1F3F0), (0x1F3F3, 0x1F3F5), (0x1F3F7, 0x1F4FD), (0x1F4FF, 0x1F53D),
+    (0x1F549, 0x1F54E), (0x1F550, 0x1F567), (0x1F56F, 0x1F570), (0x1F573, 0x1F57A),
+    (0x1F587, 0x1F587), (0x1F58A, 0x1F58D), (0x1F590, 0x1F590), (0x1F595, 0x1F596),
+    (0x1F5A4, 0x1F5A5), (0x1F5A8, 0x1F5A8), (0x1F5B1, 0x1F5B2), (0x1F5BC, 0x1F5BC),
+    (0x1F5C2, 0x1F5C4), (0x1F5D1, 0x1F5D3), (0x1F5DC, 0x1F5DE), (0x1F5E1, 0x1F5E1),
+    (0x1F5E3, 0x1F5E3), (0x1F5E8, 0x1F5E8), (0x1F5EF, 0x1F5EF), (0x1F5F3, 0x1F5F3),
+    (0x1F5FA, 0x1F64F), (0x1F680, 0x1F6C5), (0x1F6CB, 0x1F6D2), (0x1F6D5, 0x1F6D7),
+    (0x1F6DC, 0x1F6E5), (0x1F6E9, 0x1F6E9), (0x1F6EB, 0x1F6EC), (0x1F6F0, 0x1F6F0),
+    (0x1F6F3, 0x1F6FC), (0x1F7E0, 0x1F7EB), (0x1F7F0, 0x1F7F0), (0x1F90C, 0x1F93A),
+    (0x1F93C, 0x1F945), (0x1F947, 0x1F9FF), (0x1FA70, 0x1FA7C), (0x1FA80, 0x1FA89),
+    (0x1FA8F, 0x1FAC6), (0x1FACE, 0x1FADC), (0x1FADF, 0x1FAE9), (0x1FAF0, 0x1FAF8),
+)
+_EMOJI_RANGE_STARTS = tuple(start for start, _ in EMOJI_RANGES)
+_EMOJI_RANGE_ENDS = tuple(end for _, end in EMOJI_RANGES)
+
+# Characters already handled: mapped emoji plus our own replacement output
+KNOWN_EMOJI_CHARS = frozenset(
+    ch for pair in EMOJI_REPLACEMENTS.items() for text in pair for ch in text
+)
+
+def is_emoji_codepoint(cp: int) -> bool:
+    """Binary search the sorted emoji range table."""
+    index = bisect_right(_EMOJI_RANGE_STARTS, cp) - 1
+    return index >= 0 and cp <= _EMOJI_RANGE_ENDS[index]
+
+def find_unmapped_emojis(text) -> Counter:
+    """Count emoji in text that have no entry in EMOJI_REPLACEMENTS."""
+    # Counter tallies in one C-level pass; only distinct characters are classified
+    return Counter({
+        ch: count for ch, count in Counter(text).items()
+        if ch >= "\u203c" and ch not in KNOWN_EMOJI_CHARS and is_emoji_codepoint(ord(ch))
+    })
+
+def audit_file(file_path) -> Counter:
+    """Return unmapped emoji frequencies for a single file (never modifies it)."""
+    with open(file_path, 'rb') as f:
+        data = f.read()
+    if data.isascii():
+        return Counter()
+    return find_unmapped_emojis(data.decode('utf-8'))
+
+def run_audit(files, output_format="text", quiet=False):
+    """Audit files for unmapped emoji and print per-file and overall counts."""
+    per_file = {}
+    overall = Counter()
+    for file_path in files:
+        try:
+            counts = audit_file(file_path)
+        except Exception as e:
+            if not quiet:
+                print(f"✗ Error auditing {file_path}: {e}", file=sys.stderr)
+            continue
+        if counts:
+            per_file[str(file_path)] = counts
+            overall.update(counts)
+
+    if output_format == "json":
+        def _entries(counts):
+            return [
+                {"emoji": ch, "codepoint": f"U+{ord(ch):04X}", "count": count}
+                for ch, count in counts.most_common()
+            ]
+        print(json.dumps({
+            "files_scanned": len(files),
+            "files": {path: _entries(counts) for path, counts in per_file.items()},
+            "total": _entries(overall),
+        }, ensure_ascii=False, indent=2))
+    elif not quiet:
+        for path, counts in per_file.items():
+            summary = ", ".join(f"{ch} ×{count}" for ch, count in counts.most_common())
+            print(f"⚠ {path}: {summary}")
+        print(f"\nUnmapped emoji in {len(per_file)} of {len(files)} file(s):")
+        for ch, count in overall.most_common():
+            print(f"  {ch}  U+{ord(ch):04X}  {count}")
+
+    return overall
+
 def get_files_to_process(paths, extensions, files_only=False):
     """Get list of files to process based on paths and extensions.
     If files_only is True, ignore directories entirely.
@@ -199,6 +424,78 @@ def get_files_to_process(paths, extensions, files_only=False):
     
     return sorted(set(files))
 
+_HUNK_HEADER = re.compile(r"^@@ -\S+ \+(\d+)(?:,(\d+))? @@")
+
+def _git(args: list[str], cwd=None) -> str:
+    # Pathspecs are always file or directory names, never glob patterns
+    result = subprocess.run(
+        ["git", "--literal-pathspecs", *args],
+        cwd=cwd, capture_output=True, text=True, encoding="utf-8", check=True,
+    )
+    return result.stdout
+
+def _git_names(args: list[str], scope=(), cwd=None) -> list[str]:
+    """Run a git command with -z and return the NUL-separated, unquoted paths.
+    scope holds the "--" separator and pathspecs, which must come after -z.
+    """
+    return [name for name in _git([*args, "-z", *scope], cwd).split("\0") if name]
+
+def _hunk_ranges(diff_output: str) -> list[tuple[int, int]]:
+    """Extract new-side (start, end) line ranges from a single-file -U0 diff."""
+    ranges = []
+    for line in diff_output.splitlines():
+        match = _HUNK_HEADER.match(line)
+        if match:
+            start, count = int(match.group(1)), int(match.group(2) or 1)
+            if count:
+                ranges.append((start, start + count - 1))
+    return ranges
+
+def get_git_changes(staged=False, base=None, pathspecs=(), extensions=None, hunks=False, cwd=None):
+    """Get files changed in the local git repo, mapped to their changed line ranges.
+    By default compares the working tree (staged and unstaged) with HEAD, or
+    with the merge-base of base and HEAD when base is given. With staged=True
+    only the index is compared. Line ranges are None unless hunks is True.
+    Raises ValueError for staged hunks in files that also have unstaged edits,
+    since index line numbers would not match the working-tree file.
+    """
+    root = Path(_git(["rev-parse", "--show-toplevel"], cwd).strip())
+    if staged:
+        diff_args = ["diff", "--cached"]
+    else:
+        ref = _git(["merge-base", base, "HEAD"], cwd).strip() if base else "HEAD"
+        diff_args = ["diff", ref]
+    diff_args += ["--no-ext-diff", "--no-color", "--diff-filter=d"]
+    scope = ["--", *[str(Path(p).resolve()) for p in pathspecs]] if pathspecs else []
+
+    names = _git_names([*diff_args, "--name-only"], scope, root)
+    if not staged and not base:
+        # Also pick up modified files when HEAD has no counterpart in the index
+        names += _git_names(["ls-files", "-m", "--full-name"], scope, root)
+
+    changes: dict[Path, list[tuple[int, int]] | None] = {}
+    for name in names:
+        path = root / name
+        if extensions and path.suffix.lstrip(".") not in extensions:
+            continue
+        if path.is_file():
+            changes[path] = None
+
+    if hunks and changes:
+        if staged:
+            unstaged = {root / name for name in _git_names(["diff", "--name-only"], scope, root)}
+            conflicts = sorted(str(path.relative_to(root)) for path in changes if path in unstaged)
+            if conflicts:
+                raise ValueError(
+                    "--staged --hunks cannot be used on files with unstaged changes: "
+                    + ", ".join(conflicts)
+                )
+        # One diff per file keeps hunk ownership unambiguous for any filename
+        for path in changes:
+            changes[path] = _hunk_ranges(_git([*diff_args, "-U0", "--", str(path)], root))
+
+    return changes
+
 def _paths_from_env() -> list[str]:
     """Attempt to infer a single target file from environment variables.
     This enables calling the script with no args when the launcher injects
@@ -223,6 +520,186 @@ def _paths_from_env() -> list[str]:
                 return [str(p)]
     return []
 
+# --serve speaks two protocols on the same socket, told apart by the first bytes:
+# - framed: the client opens with FRAME_MAGIC, then sends any number of requests,
+#   each a 4-byte big-endian size + UTF-8 text. Replies use the same framing with
+#   a one-byte status prefix in the payload ("+" result, "!" error message).
+# - raw: anything else is UTF-8 text up to EOF (half-close); the server answers
+#   with the substituted text and closes. This is what `socat` or `nc -U -N` send.
+#   On error the connection is closed with no output.
+FRAME_MAGIC = b"\x00ES1"
+_FRAME_HEADER = struct.Struct(">I")
+_REPLY_OK = b"+"
+_REPLY_ERROR = b"!"
+
+def _default_socket_path() -> str:
+    """Per-user socket path: $EMOJI_SUBSTITUTE_SOCKET, else $XDG_RUNTIME_DIR, else a uid-tagged temp file."""
+    override = os.environ.get("EMOJI_SUBSTITUTE_SOCKET")
+    if override:
+        return override
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return os.path.join(runtime_dir, "emoji_substitute.sock")
+    user = os.getuid() if hasattr(os, "getuid") else getpass.getuser()
+    return os.path.join(tempfile.gettempdir(), f"emoji_substitute-{user}.sock")
+
+DEFAULT_SOCKET_PATH = _default_socket_path()
+
+def _recv_upto(sock, size):
+    """Read up to size bytes, stopping early only if the peer closes."""
+    chunks = []
+    while size:
+        chunk = sock.recv(size)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+def _recv_exact(sock, size):
+    """Read exactly size bytes, or return None if the peer closed first."""
+    data = _recv_upto(sock, size)
+    return data if len(data) == size else None
+
+def _recv_all(sock):
+    chunks = []
+    while True:
+        chunk = sock.recv(65536)
+        if not chunk:
+            return b"".join(chunks)
+        chunks.append(chunk)
+
+def _send_frame(sock, payload: bytes) -> None:
+    sock.sendall(_FRAME_HEADER.pack(len(payload)) + payload)
+
+def _recv_frame(sock):
+    header = _recv_exact(sock, _FRAME_HEADER.size)
+    if header is None:
+        return None
+    (size,) = _FRAME_HEADER.unpack(header)
+    return _recv_exact(sock, size) if size else b""
+
+class _SubstituteHandler(socketserver.BaseRequestHandler):
+    """Answer framed requests until disconnect, or a single raw request."""
+
+    def handle(self):
+        try:
+            prefix = _recv_upto(self.request, len(FRAME_MAGIC))
+            if prefix == FRAME_MAGIC:
+                self._handle_framed()
+            elif prefix:
+                self._handle_raw(prefix)
+        except (BrokenPipeError, ConnectionResetError):
+            # Client went away (including another --serve probing the socket)
+            pass
+
+    def _handle_framed(self):
+        while True:
+            payload = _recv_frame(self.request)
+            if payload is None:
+                return
+            try:
+                new_text, _ = replace_emojis_in_text(payload.decode("utf-8"))
+            except UnicodeDecodeError as e:
+                _send_frame(self.request, _REPLY_ERROR + str(e).encode("utf-8"))
+                continue
+            _send_frame(self.request, _REPLY_OK + new_text.encode("utf-8"))
+
+    def _handle_raw(self, prefix):
+        try:
+            text = (prefix + _recv_all(self.request)).decode("utf-8")
+        except UnicodeDecodeError:
+            return
+        new_text, _ = replace_emojis_in_text(text)
+        self.request.sendall(new_text.encode("utf-8"))
+
+def _claim_socket_path(socket_path):
+    """Remove a stale socket left by a dead server; refuse anything else."""
+    try:
+        mode = os.lstat(socket_path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise OSError(f"{socket_path} exists and is not a socket")
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(socket_path)
+        except ConnectionRefusedError:
+            os.unlink(socket_path)
+            return
+    raise OSError(f"a server is already listening on {socket_path}")
+
+def serve(socket_path=DEFAULT_SOCKET_PATH, quiet=False):
+    """Run a long-lived substitution server on a Unix socket.
+    See the protocol notes above; the socket is only accessible to the current user.
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        raise OSError("Unix sockets are not supported on this platform")
+    _claim_socket_path(socket_path)
+    with socketserver.ThreadingUnixStreamServer(socket_path, _SubstituteHandler) as server:
+        server.daemon_threads = True
+        os.chmod(socket_path, 0o600)
+        if not quiet:
+            print(f"⊙ Serving on {socket_path} (Ctrl+C to stop)", file=sys.stderr)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            try:
+                if stat.S_ISSOCK(os.lstat(socket_path).st_mode):
+                    os.unlink(socket_path)
+            except FileNotFoundError:
+                pass
+
+def connect_to_server(socket_path=DEFAULT_SOCKET_PATH):
+    """Open a persistent framed connection to a running --serve instance."""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(socket_path)
+        sock.sendall(FRAME_MAGIC)
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+def substitute_via_server(text: str, socket_path=DEFAULT_SOCKET_PATH, sock=None) -> str:
+    """Send text to a running --serve instance and return the result.
+    Pass a sock from connect_to_server() to reuse a persistent connection.
+    """
+    if sock is not None:
+        _send_frame(sock, text.encode("utf-8"))
+        reply = _recv_frame(sock)
+    else:
+        with connect_to_server(socket_path) as conn:
+            _send_frame(conn, text.encode("utf-8"))
+            reply = _recv_frame(conn)
+    if not reply:
+        raise ConnectionError("Server closed the connection without replying")
+    if reply[:1] == _REPLY_ERROR:
+        raise ValueError(f"Server error: {reply[1:].decode('utf-8')}")
+    return reply[1:].decode("utf-8")
+
+def filter_stdin(verbose=False, quiet=False) -> int:
+    """Read text from stdin, write the substituted text to stdout.
+    Output bytes are untouched apart from the replacements, so line endings
+    survive. Replacement details go to stderr. Returns None, with nothing
+    written to stdout, if the input is not valid UTF-8.
+    """
+    try:
+        text = sys.stdin.buffer.read().decode("utf-8")
+    except UnicodeDecodeError as e:
+        if not quiet:
+            print(f"✗ Error processing stdin: {e}", file=sys.stderr)
+        return None
+    new_text, replacements = replace_emojis_in_text(text)
+    sys.stdout.buffer.write(new_text.encode("utf-8"))
+    sys.stdout.flush()
+    if verbose and not quiet:
+        for replacement in replacements:
+            print(f"  {replacement}", file=sys.stderr)
+    return len(replacements)
+
 def main():
     parser = argparse.ArgumentParser(
         description="Replace emojis with monospace-friendly Unicode characters in code files"
@@ -268,15 +745,128 @@ def main():
         action="store_true",
         help="Process only explicit file paths; ignore directories"
     )
+    parser.add_argument(
+        "--no-prefilter",
+        action="store_true",
+        help="Decode and scan every file, even those with no emoji lead bytes"
+    )
+    parser.add_argument(
+        "--audit",
+        action="store_true",
+        help="Report unmapped emoji per file and overall without modifying files"
+    )
+    parser.add_argument(
+        "--audit-format",
+        choices=["text", "json"],
+        default="text",
+        help="Output format for --audit (default: text)"
+    )
+    parser.add_argument(
+        "--changed",
+        action="store_true",
+        help="Process only files changed in the working tree (vs HEAD, or vs --base)"
+    )
+    parser.add_argument(
+        "--staged",
+        action="store_true",
+        help="Process only files staged in the git index"
+    )
+    parser.add_argument(
+        "--base",
+        metavar="REF",
+        help="With --changed, compare against the merge-base of REF and HEAD (e.g. main)"
+    )
+    parser.add_argument(
+        "--hunks",
+        action="store_true",
+        help="With --changed/--staged, rewrite only the changed line ranges"
+    )
+    parser.add_argument(
+        "--report",
+        choices=["text", "json"],
+        help="Print a run report (files, bytes, per-emoji counts, phase timings, MB/s); "
+             "json replaces the normal console output"
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Run under cProfile, dump stats to --profile-output and print the top entries to stderr"
+    )
+    parser.add_argument(
+        "--profile-output",
+        metavar="PATH",
+        default="emoji_substitute.prof",
+        help="File for --profile stats (default: emoji_substitute.prof)"
+    )
+    parser.add_argument(
+        "--stdin",
+        action="store_true",
+        help="Filter mode: read text from stdin and write the result to stdout"
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Run a persistent substitution server on a Unix socket"
+    )
+    parser.add_argument(
+        "--socket",
+        default=DEFAULT_SOCKET_PATH,
+        help=f"Socket path for --serve (default: {DEFAULT_SOCKET_PATH})"
+    )
     
     args = parser.parse_args()
 
+    if not args.profile:
+        _run(args, parser)
+        return
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        _run(args, parser)
+    except SystemExit:
+        # Argument or input errors: nothing worth profiling, and no file written
+        profiler.disable()
+        raise
+    profiler.disable()
+    profiler.dump_stats(args.profile_output)
+    pstats.Stats(profiler, stream=sys.stderr).sort_stats("cumulative").print_stats(20)
+    print(f"⊙ Profile written to {args.profile_output}", file=sys.stderr)
+
+def _run(args, parser):
+    """Execute the mode selected by the parsed command-line arguments."""
+    if args.report and (args.stdin or args.serve or args.audit or args.list_mappings):
+        parser.error("--report only applies when processing files; "
+                     "it cannot be combined with --stdin, --serve, --audit or --list-mappings")
+    if args.report == "json":
+        args.quiet = True
+
+    if args.stdin:
+        if filter_stdin(args.verbose, args.quiet) is None:
+            sys.exit(1)
+        return
+
+    if args.serve:
+        try:
+            serve(args.socket, args.quiet)
+        except OSError as e:
+            parser.error(f"Cannot serve on {args.socket}: {e}")
+        return
+
+    git_mode = args.changed or args.staged
+    if args.changed and args.staged:
+        parser.error("--changed and --staged are mutually exclusive")
+    if args.hunks and not git_mode:
+        parser.error("--hunks requires --changed or --staged")
+    if args.base and not args.changed:
+        parser.error("--base requires --changed")
+
     # If no paths were supplied, try to infer from environment (Explorer selection)
     provided_paths = list(args.paths) if args.paths else []
-    if not provided_paths:
+    if not provided_paths and not git_mode:
         provided_paths = _paths_from_env()
     
-    if not provided_paths and not args.list_mappings:
+    if not provided_paths and not args.list_mappings and not git_mode:
         parser.error(
             "No paths provided and no TARGET_FILE-like environment variable found. "
             "Pass a file path or set TARGET_FILE in the environment."
@@ -289,28 +879,68 @@ def main():
             print(f"{emoji} → {unicode_char}")
         return
     
-    # Safety: if exactly one path and it's a file, force files_only behavior
-    files_only = args.files_only or (len(provided_paths) == 1 and Path(provided_paths[0]).is_file())
+    stats = Counter()
+    run_started = time.perf_counter()
+    git_changes = {}
+    if git_mode:
+        try:
+            git_changes = get_git_changes(
+                staged=args.staged, base=args.base, pathspecs=provided_paths,
+                extensions=args.extensions, hunks=args.hunks,
+            )
+        except (OSError, subprocess.CalledProcessError) as e:
+            detail = getattr(e, "stderr", None) or e
+            parser.error(f"git query failed: {str(detail).strip()}")
+        except ValueError as e:
+            parser.error(str(e))
+        files = sorted(git_changes)
+    else:
+        # Safety: if exactly one path and it's a file, force files_only behavior
+        files_only = args.files_only or (len(provided_paths) == 1 and Path(provided_paths[0]).is_file())
 
-    files = get_files_to_process(provided_paths, args.extensions, files_only=files_only)
+        files = get_files_to_process(provided_paths, args.extensions, files_only=files_only)
+    stats["discovery_seconds"] += time.perf_counter() - run_started
     
     if not files:
         if not args.quiet:
             print("No files found to process")
-        return
+        # Machine-readable output is still emitted, just empty
+        if not args.report and not (args.audit and args.audit_format == "json"):
+            return
     
-    if not args.quiet:
+    if args.audit:
+        run_audit(files, args.audit_format, args.quiet)
+        return
+
+    if files and not args.quiet:
         print(f"Processing {len(files)} file(s)...")
         if args.dry_run:
             print("⌕ DRY RUN - No files will be modified")
         print()
     
     total_replacements = 0
+    emoji_counts = Counter()
     for file_path in files:
-        total_replacements += process_file(file_path, args.dry_run, args.verbose, args.quiet)
+        total_replacements += process_file(
+            file_path, args.dry_run, args.verbose, args.quiet,
+            prefilter=not args.no_prefilter, stats=stats,
+            line_ranges=git_changes.get(file_path), emoji_counts=emoji_counts,
+        )
     
-    if not args.quiet:
+    if files and not args.quiet:
         print(f"\n{'⌕ Would replace' if args.dry_run else '✓ Replaced'} {total_replacements} emoji(s) total")
+        if not args.no_prefilter:
+            print(f"⌕ Prefilter skipped {stats['prefiltered']} of {len(files)} file(s)")
+
+    if args.report:
+        report = build_run_report(
+            len(files), stats, emoji_counts, total_replacements,
+            time.perf_counter() - run_started, args.dry_run,
+        )
+        if args.report == "json":
+            print(json.dumps(report, ensure_ascii=False, indent=2))
+        else:
+            _print_run_report(report)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,44 @@
+#!/usr/bin/env sh
+# Emoji substitution client for a running `emoji_substitute.py --serve`.
+# Rewrites FILE in place without starting a Python interpreter, using the
+# server's raw protocol (send text, half-close, read the reply). Falls back to
+# `emoji_substitute.py --stdin` if socat or the server is unavailable. Both paths
+# run the same substitution on the raw bytes, so line endings are preserved and
+# the output is identical either way.
+#
+# Usage: emoji_substitute_client.sh FILE [SOCKET]
+
+set -eu
+
+file=$1
+sock=${2:-${EMOJI_SUBSTITUTE_SOCKET:-}}
+script_dir=$(dirname "$0")
+
+# Same default as emoji_substitute.py: $XDG_RUNTIME_DIR, else a uid-tagged temp file
+if [ -z "$sock" ]; then
+    if [ -n "${XDG_RUNTIME_DIR:-}" ]; then
+        sock=$XDG_RUNTIME_DIR/emoji_substitute.sock
+    else
+        tmp_dir=${TMPDIR:-/tmp}
+        sock=${tmp_dir%/}/emoji_substitute-$(id -u).sock
+    fi
+fi
+
+out=$(mktemp "$file.emoji.XXXXXX")
+trap 'rm -f "$out"' EXIT
+
+if command -v socat >/dev/null 2>&1 && [ -S "$sock" ]; then
+    socat -t 5 - "UNIX-CONNECT:$sock" < "$file" > "$out"
+    # The server closes without a reply when the input is not valid UTF-8
+    if [ -s "$file" ] && [ ! -s "$out" ]; then
+        echo "✗ Error processing $file: no reply from server (is it UTF-8?)" >&2
+        exit 1
+    fi
+else
+    python3 "$script_dir/emoji_substitute.py" --stdin < "$file" > "$out"
+fi
+
+# Write through the original file so its permissions and inode are kept
+if ! cmp -s "$file" "$out"; then
+    cat "$out" > "$file"
+fi
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Tests for the git-scoped modes of emoji_substitute.py
+Each test builds a throwaway git repo and runs the script as the CLI would.
+"""
+
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+SCRIPT_PATH = Path(__file__).resolve().parent / "emoji_substitute.py"
+
+@unittest.skipUnless(shutil.which("git"), "git is not installed")
+class GitScopedModeTests(unittest.TestCase):
+    def setUp(self):
+        self.repo = Path(tempfile.mkdtemp(prefix="emoji_git_"))
+        self.addCleanup(shutil.rmtree, self.repo, ignore_errors=True)
+        self._git("init", "-q")
+        self._git("config", "user.email", "test@example.com")
+        self._git("config", "user.name", "test")
+
+    def _git(self, *args):
+        return subprocess.run(["git", *args], cwd=self.repo, check=True, capture_output=True, text=True).stdout
+
+    def _write(self, name, data: bytes):
+        path = self.repo / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+        return path
+
+    def _commit_all(self):
+        self._git("add", "-A")
+        self._git("commit", "-q", "-m", "snapshot")
+
+    def _run(self, *args):
+        return subprocess.run(
+            [sys.executable, str(SCRIPT_PATH), "-q", *args],
+            cwd=self.repo, capture_output=True, text=True, encoding="utf-8",
+        )
+
+    def test_changed_with_path_only_touches_that_file(self):
+        self._write("a.md", "a ✅\n".encode())
+        self._write("b.md", "b ✅\n".encode())
+        self._commit_all()
+        a = self._write("a.md", "a ✅ edited\n".encode())
+        b = self._write("b.md", "b ✅ edited\n".encode())
+
+        result = self._run("--changed", str(a))
+
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(a.read_text(encoding="utf-8"), "a ✓ edited\n")
+        self.assertEqual(b.read_text(encoding="utf-8"), "b ✅ edited\n")
+
+    def test_changed_handles_names_with_spaces_and_quotes(self):
+        spaced = self._write("sub/my file.md", "x ✅\n".encode())
+        quoted = self._write('q"x.md', "y ✅\n".encode())
+        self._commit_all()
+        spaced.write_bytes("x ✅\nz ✅\n".encode())
+        quoted.write_bytes("y ✅\nz ✅\n".encode())
+
+        result = self._run("--changed", "--hunks")
+
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(spaced.read_text(encoding="utf-8"), "x ✅\nz ✓\n")
+        self.assertEqual(quoted.read_text(encoding="utf-8"), "y ✅\nz ✓\n")
+
+    def test_hunks_keep_crlf_and_untouched_lines(self):
+        path = self._write("a.md", "l1 \x0c ✅\r\nl2 ✅\r\nl3 ✅\r\n".encode())
+        self._commit_all()
+        path.write_bytes("l1 \x0c ✅\r\nl2 ✅\r\nl3 ✅ edited\r\n".encode())
+
+        result = self._run("--changed", "--hunks", str(path))
+
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(path.read_bytes(), "l1 \x0c ✅\r\nl2 ✅\r\nl3 ✓ edited\r\n".encode())
+
+    def test_staged_hunks_rejects_files_with_unstaged_edits(self):
+        path = self._write("a.md", "l1\nl2\nl3 ✅\n".encode())
+        self._commit_all()
+        path.write_bytes("l1\nl2\nl3 ✅ staged\n".encode())
+        self._git("add", "a.md")
+        path.write_bytes("top\nl1\nl2\nl3 ✅ staged\n".encode())
+
+        result = self._run("--staged", "--hunks")
+
+        self.assertEqual(result.returncode, 2)
+        self.assertIn("unstaged changes: a.md", result.stderr)
+        self.assertEqual(path.read_bytes(), "top\nl1\nl2\nl3 ✅ staged\n".encode())
+
+if __name__ == "__main__":
+    unittest.main()
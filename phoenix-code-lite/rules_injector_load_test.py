@@ -0,0 +1,298 @@
+"""DSS Rules Injector load-test harness
+End-to-end concurrent load test for rules_injector_server_current.py over STDIO.
+
+Launches the real server as a subprocess against a generated rules tree,
+drives it with an MCP client session and reports throughput, latency
+percentiles, peak RSS and time-to-first-response. Unlike microbenchmarks of
+the tool functions, this includes JSON-RPC framing, pydantic validation of
+the tool parameters and the anyio stdio loop in `_run()`.
+
+Usage:
+    python rules_injector_load_test.py --requests 2000 --concurrency 16 --list-ratio 0.2
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+import anyio
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+
+try:  # Peak RSS of reaped children is only available on Unix
+    import resource
+except ImportError:  # pragma: no cover - Windows
+    resource = None  # type: ignore[assignment]
+
+SERVER_SCRIPT = Path(__file__).resolve().parent / "rules_injector_server_current.py"
+
+# ---------------------------------------------------------------------------
+# Rules tree generation
+# ---------------------------------------------------------------------------
+
+def _server_rule_layout() -> tuple[list[str], dict[str, list[str]]]:
+    """Read the bootstrap and context rule lists from the server module."""
+    sys.path.insert(0, str(SERVER_SCRIPT.parent))
+    try:
+        import rules_injector_server_current as server
+    finally:
+        sys.path.pop(0)
+    return list(server.DEFAULT_BOOTSTRAP_RULES), dict(server.CONTEXT_RULE_MAP)
+
+def build_project(root: Path, extra_rules: int, rule_size: int, seed: int) -> list[str]:
+    """
+    Create a throwaway project containing the server script and a rules tree.
+
+    The server resolves its rules from `<script dir>/../.cursor/rules`, so the
+    script is copied into `root/src/` next to a generated `root/.cursor/rules`.
+
+    Args:
+        root: Empty directory to populate
+        extra_rules: Number of additional rule files per category
+        rule_size: Approximate body size of each rule file in bytes
+        seed: Seed for deterministic rule content
+
+    Returns:
+        Relative paths of every generated rule file
+    """
+    rng = random.Random(seed)
+    bootstrap, context_map = _server_rule_layout()
+    rules_dir = root / ".cursor" / "rules"
+
+    names = set(bootstrap)
+    for suggestions in context_map.values():
+        names.update(suggestions)
+    for category in ("workflows", "guidelines", "config"):
+        names.update(f"{category}/{i + 50:02d}-generated-{i}.mdc" for i in range(extra_rules))
+
+    words = ["rule", "agent", "must", "should", "validate", "context", "task", "DSS", "file", "update"]
+    for name in sorted(names):
+        path = rules_dir / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        body_words = [rng.choice(words) for _ in range(max(1, rule_size // 6))]
+        body = "\n".join(" ".join(body_words[i:i + 12]) for i in range(0, len(body_words), 12))
+        path.write_text(
+            f"---\ndescription: Generated rule {name}\n---\n\n# {Path(name).stem}\n\n{body}\n",
+            encoding="utf-8",
+        )
+
+    (root / "src").mkdir()
+    shutil.copy2(SERVER_SCRIPT, root / "src" / SERVER_SCRIPT.name)
+    return sorted(names)
+
+# ---------------------------------------------------------------------------
+# Request mix
+# ---------------------------------------------------------------------------
+
+def build_request_mix(
+    count: int, list_ratio: float, rule_names: list[str], seed: int
+) -> list[tuple[str, dict[str, Any]]]:
+    """
+    Build a deterministic sequence of (tool name, arguments) calls.
+
+    `get_dss_rules` calls cycle through the parameter shapes the server
+    accepts (omitted, list, comma string, malformed brackets) so validation
+    paths are exercised as well as file reads.
+    """
+    rng = random.Random(seed)
+    contexts = ["", "code", "documentation", "validation", "tasks", "github", "maintenance", "templates"]
+    categories = ["all", "workflows", "guidelines", "config"]
+    calls: list[tuple[str, dict[str, Any]]] = []
+
+    for _ in range(count):
+        if rng.random() < list_ratio:
+            calls.append(("list_available_rules", {
+                "category": rng.choice(categories),
+                "include_descriptions": rng.random() < 0.5,
+            }))
+            continue
+
+        picked = rng.sample(rule_names, k=min(len(rule_names), rng.randint(1, 4)))
+        shape = rng.randrange(4)
+        if shape == 0:
+            arguments: dict[str, Any] = {}
+        elif shape == 1:
+            arguments = {"rule_files": picked}
+        elif shape == 2:
+            arguments = {"rule_files": ",".join(picked)}
+        else:
+            arguments = {"rule_files": f"[{picked[0]}]"}
+        arguments["context"] = rng.choice(contexts)
+        calls.append(("get_dss_rules", arguments))
+
+    return calls
+
+# ---------------------------------------------------------------------------
+# Load driver
+# ---------------------------------------------------------------------------
+
+def percentile(sorted_values: list[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(1, min(len(sorted_values), math.ceil(pct / 100 * len(sorted_values))))
+    return sorted_values[rank - 1]
+
+async def run_load(
+    project: Path,
+    calls: list[tuple[str, dict[str, Any]]],
+    concurrency: int,
+    server_log: Optional[Path] = None,
+) -> dict[str, Any]:
+    """
+    Launch the server, issue `calls` with `concurrency` workers and collect timings.
+
+    Returns:
+        Raw measurements: per-tool latencies, error count and startup timings
+    """
+    params = StdioServerParameters(
+        command=sys.executable,
+        args=[str(project / "src" / SERVER_SCRIPT.name)],
+        cwd=str(project),
+    )
+    latencies: dict[str, list[float]] = {}
+    errors = 0
+    first_response: Optional[float] = None
+    pending = iter(calls)
+
+    errlog = open(server_log, "w", encoding="utf-8") if server_log else open(os.devnull, "w")
+    try:
+        launched = time.perf_counter()
+        async with stdio_client(params, errlog=errlog) as (read_stream, write_stream):
+            async with ClientSession(read_stream, write_stream) as session:
+                await session.initialize()
+                initialized = time.perf_counter() - launched
+
+                async def worker() -> None:
+                    nonlocal errors, first_response
+                    for tool, arguments in pending:
+                        started = time.perf_counter()
+                        try:
+                            result = await session.call_tool(tool, arguments)
+                            failed = bool(result.isError)
+                        except Exception:
+                            failed = True
+                        finished = time.perf_counter()
+                        if first_response is None:
+                            first_response = finished - launched
+                        if failed:
+                            errors += 1
+                        latencies.setdefault(tool, []).append(finished - started)
+
+                started_load = time.perf_counter()
+                async with anyio.create_task_group() as tg:
+                    for _ in range(concurrency):
+                        tg.start_soon(worker)
+                elapsed = time.perf_counter() - started_load
+    finally:
+        errlog.close()
+
+    return {
+        "latencies": latencies,
+        "errors": errors,
+        "elapsed": elapsed,
+        "initialize_seconds": initialized,
+        "first_response_seconds": first_response,
+    }
+
+def _peak_child_rss_mb() -> Optional[float]:
+    """Peak RSS of reaped child processes (the server) in MB, if the platform reports it."""
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes
+    return round(max_rss / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+def summarize(raw: dict[str, Any], concurrency: int) -> dict[str, Any]:
+    """Turn raw measurements into the report dictionary."""
+    def stats(values: list[float]) -> dict[str, Any]:
+        ordered = sorted(values)
+        return {
+            "count": len(ordered),
+            **{
+                f"p{p}_ms": round(percentile(ordered, p) * 1000, 3) if ordered else None
+                for p in (50, 95, 99)
+            },
+            "max_ms": round(ordered[-1] * 1000, 3) if ordered else None,
+        }
+
+    all_latencies = [value for values in raw["latencies"].values() for value in values]
+    total = len(all_latencies)
+    return {
+        "requests": total,
+        "errors": raw["errors"],
+        "concurrency": concurrency,
+        "elapsed_seconds": round(raw["elapsed"], 3),
+        "requests_per_second": round(total / raw["elapsed"], 1) if raw["elapsed"] > 0 else None,
+        "latency": stats(all_latencies),
+        "latency_by_tool": {tool: stats(values) for tool, values in sorted(raw["latencies"].items())},
+        "initialize_seconds": round(raw["initialize_seconds"], 3),
+        "time_to_first_response_seconds": (
+            round(raw["first_response_seconds"], 3) if raw["first_response_seconds"] is not None else None
+        ),
+        "server_peak_rss_mb": _peak_child_rss_mb(),
+    }
+
+def print_report(report: dict[str, Any]) -> None:
+    print("# DSS Rules Injector load test\n")
+    print(f"Requests:        {report['requests']} ({report['errors']} error(s)), concurrency {report['concurrency']}")
+    print(f"Throughput:      {report['requests_per_second']} req/s over {report['elapsed_seconds']}s")
+    print(f"Initialize:      {report['initialize_seconds']}s")
+    print(f"First response:  {report['time_to_first_response_seconds']}s after launch")
+    rss = report["server_peak_rss_mb"]
+    print(f"Server peak RSS: {f'{rss} MB' if rss is not None else 'unavailable on this platform'}")
+    print("\nLatency (ms)       count      p50      p95      p99      max")
+    rows = [("all", report["latency"]), *report["latency_by_tool"].items()]
+    for name, row in rows:
+        print(
+            f"  {name:<16}{row['count']:>7}"
+            + "".join(f"{row[key]:>9}" for key in ("p50_ms", "p95_ms", "p99_ms", "max_ms"))
+        )
+
+# ---------------------------------------------------------------------------
+# Entrypoint
+# ---------------------------------------------------------------------------
+
+def main() -> None:  # pragma: no cover
+    parser = argparse.ArgumentParser(description="Concurrent stdio load test for the DSS Rules Injector MCP server")
+    parser.add_argument("--requests", "-n", type=int, default=1000, help="Total tool calls to issue (default: 1000)")
+    parser.add_argument("--concurrency", "-c", type=int, default=8, help="Concurrent in-flight calls (default: 8)")
+    parser.add_argument("--list-ratio", type=float, default=0.2,
+                        help="Fraction of calls that are list_available_rules; the rest are get_dss_rules (default: 0.2)")
+    parser.add_argument("--extra-rules", type=int, default=20,
+                        help="Generated rule files per category on top of the server's known rules (default: 20)")
+    parser.add_argument("--rule-size", type=int, default=4000, help="Approximate rule file size in bytes (default: 4000)")
+    parser.add_argument("--seed", type=int, default=1, help="Seed for the rules tree and request mix (default: 1)")
+    parser.add_argument("--server-log", type=Path, help="Write server stderr logging to this file instead of discarding it")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    if not 0.0 <= args.list_ratio <= 1.0:
+        parser.error("--list-ratio must be between 0 and 1")
+    if args.requests < 1 or args.concurrency < 1:
+        parser.error("--requests and --concurrency must be positive")
+
+    with tempfile.TemporaryDirectory(prefix="dss_load_") as tmp:
+        project = Path(tmp)
+        rule_names = build_project(project, args.extra_rules, args.rule_size, args.seed)
+        calls = build_request_mix(args.requests, args.list_ratio, rule_names, args.seed)
+        raw = anyio.run(run_load, project, calls, args.concurrency, args.server_log)
+
+    report = summarize(raw, args.concurrency)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+if __name__ == "__main__":
+    main()